@@ -0,0 +1,245 @@
+"""
+Link metadata micro-benchmark
+Replays captured mirror pages through the source plugins, checks that
+extract_link_metadata agrees with the original per-field extractors on
+every string the plugins pass it, and reports time per link and the
+cache hit rate
+Run: python bench_link_metadata.py --capture pages/  (fetches mirror pages)
+     python bench_link_metadata.py pages/
+"""
+
+import sys
+import json
+import random
+import re
+import timeit
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from link_metadata import LinkMetadata, extract_link_metadata, parse_link_metadata
+from sources import SOURCE_URLS, load_source
+
+MANIFEST = 'manifest.json'
+
+
+def legacy_subject_code(text: str) -> Optional[str]:
+    """Original extract_subject_code"""
+    for pattern in [r'([A-Z]{2,3}\d{3})', r'([A-Z]{2,4}\d{4})', r'(\d{2}[A-Z]{2,3}\d{3})']:
+        match = re.search(pattern, text.upper())
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_module_number(text: str) -> int:
+    """Original extract_module_number"""
+    match = re.search(r'module\s*[-:]?\s*(\d+)', text, re.IGNORECASE)
+    return int(match.group(1)) if match else 1
+
+
+def legacy_year(text: str) -> Optional[int]:
+    """Original extract_year"""
+    match = re.search(r'(20[1-2]\d)', text)
+    return int(match.group(1)) if match else None
+
+
+def legacy_exam_type(text: str) -> str:
+    """Original _extract_exam_type"""
+    text_lower = text.lower()
+    if 'supply' in text_lower or 'supplementary' in text_lower:
+        return 'supplementary'
+    elif 'model' in text_lower:
+        return 'model'
+    elif 'solved' in text_lower:
+        return 'solved'
+    return 'regular'
+
+
+def legacy_month(text: str) -> Optional[str]:
+    """Original _extract_month"""
+    months = ['january', 'february', 'march', 'april', 'may', 'june',
+              'july', 'august', 'september', 'october', 'november', 'december']
+    text_lower = text.lower()
+    for month in months:
+        if month in text_lower:
+            return month.capitalize()
+    return None
+
+
+def legacy_extract(text: str) -> LinkMetadata:
+    """Run every original extractor over the same text"""
+    return LinkMetadata(
+        subject_code=legacy_subject_code(text),
+        module_number=legacy_module_number(text),
+        year=legacy_year(text),
+        exam_type=legacy_exam_type(text),
+        month=legacy_month(text),
+    )
+
+
+def fuzz_corpus(count: int, seed: int = 0) -> list[str]:
+    """Build strings that glue tokens together to provoke overlapping matches"""
+    tokens = ['CST', 'may', 'MAY', 'Module', 'module-', ' : ', '2019', '201', '2', '21',
+              'supply', 'suppl', 'ementary', 'model', 'modul', 'solved', 'solve',
+              'december', 'dec', 'june', 'july', 'mar', 'ch', 'ſ', 'ß', 'K', '-', ' ', '/']
+    rng = random.Random(seed)
+    return [''.join(rng.choice(tokens) for _ in range(rng.randint(1, 8)))
+            for _ in range(count)]
+
+
+def check_equivalence(texts: list[str]) -> int:
+    """Assert extract_link_metadata matches the original extractors, return texts checked"""
+    for text in texts:
+        expected = legacy_extract(text)
+        actual = parse_link_metadata(text)
+        assert actual == expected, f"{text!r}: {actual} != {expected}"
+    return len(texts)
+
+
+def _new_plugin(base_url: str, user_agent: str):
+    """Create the plugin for a source outside of a scraper run"""
+    session = requests.Session()
+    session.headers['User-Agent'] = user_agent
+    return load_source(base_url)(SimpleNamespace(session=session), base_url)
+
+
+def capture(directory: Path, pages_per_type: int):
+    """Save the pages each source would scrape, with a manifest to replay them"""
+    from scraper import USER_AGENT
+
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for base_url in SOURCE_URLS:
+        plugin = _new_plugin(base_url, USER_AGENT)
+        plugin.max_pages = pages_per_type
+        for page_url, content_type in plugin.discover():
+            try:
+                response = plugin.fetch(page_url)
+            except requests.RequestException as e:
+                print(f"Skipped {page_url}: {e}")
+                continue
+            name = f"{len(manifest):04d}.html"
+            (directory / name).write_bytes(response.content)
+            manifest.append({
+                'file': name,
+                'base_url': base_url,
+                'page_url': page_url,
+                'content_type': content_type,
+            })
+            print(f"Saved {page_url}")
+
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    print(f"Captured {len(manifest)} pages in {directory}")
+
+
+def record_calls(directory: Path) -> list[tuple[str, bool]]:
+    """Parse the captured pages and return every extractor call in order
+
+    Each call is (text, cached): whether the plugin went through the
+    LRU-cached extract_link_metadata or the uncached parse_link_metadata.
+    """
+    manifest = json.loads((directory / MANIFEST).read_text())
+    calls = []
+
+    def recorder(extract, cached):
+        def record(text):
+            calls.append((text, cached))
+            return extract(text)
+        return record
+
+    plugins = {}
+    patched = {}
+    try:
+        for page in manifest:
+            plugin = plugins.get(page['base_url'])
+            if plugin is None:
+                plugin = _new_plugin(page['base_url'], 'bench')
+                plugin.get_file_size = lambda url: None  # No network while replaying
+                plugins[page['base_url']] = plugin
+                # Plugins import the extractors by name, so swap them per module
+                for cls in type(plugin).__mro__:
+                    module = sys.modules[cls.__module__]
+                    if module not in patched and hasattr(module, 'extract_link_metadata'):
+                        patched[module] = (module.extract_link_metadata,
+                                           getattr(module, 'parse_link_metadata', None))
+                        module.extract_link_metadata = recorder(extract_link_metadata, True)
+                        module.parse_link_metadata = recorder(parse_link_metadata, False)
+
+            soup = BeautifulSoup((directory / page['file']).read_bytes(), 'html.parser')
+            plugin.parse_page(soup, page['page_url'], page['content_type'])
+    finally:
+        for module, (extract, parse) in patched.items():
+            module.extract_link_metadata = extract
+            if parse is None:
+                del module.parse_link_metadata
+            else:
+                module.parse_link_metadata = parse
+
+    return calls
+
+
+def main():
+    """Check equivalence, then time the original and new extractors"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('pages', nargs='?', type=Path,
+                        help="directory of captured pages to replay")
+    parser.add_argument('--capture', action='store_true',
+                        help="fetch pages from the sources into the directory first")
+    parser.add_argument('--pages-per-type', type=int, default=25,
+                        help="pages to capture per source and content type")
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.capture:
+        if not args.pages:
+            parser.error("--capture needs a directory")
+        capture(args.pages, args.pages_per_type)
+
+    checked = check_equivalence(fuzz_corpus(20000))
+    if not args.pages:
+        print(f"Equivalence: {checked} fuzzed texts match")
+        print("Pass a directory of captured pages to time real link texts")
+        return
+
+    calls = record_calls(args.pages)
+    texts = [text for text, _ in calls]
+    checked += check_equivalence(texts)
+    print(f"Equivalence: {checked} texts match")
+    if not calls:
+        print("The captured pages produced no extractor calls")
+        return
+
+    def call_sites():
+        extract_link_metadata.cache_clear()
+        for text, cached in calls:
+            if cached:
+                extract_link_metadata(text)
+            else:
+                parse_link_metadata(text)
+
+    rounds = args.rounds
+    legacy = timeit.timeit(lambda: [legacy_extract(t) for t in texts], number=rounds)
+    uncached = timeit.timeit(lambda: [parse_link_metadata(t) for t in texts], number=rounds)
+    # The cache is cleared every round, so each round is one scraper run
+    cached = timeit.timeit(call_sites, number=rounds)
+
+    call_sites()
+    info = extract_link_metadata.cache_info()
+    lookups = info.hits + info.misses
+    cached_calls = sum(1 for _, is_cached in calls if is_cached)
+
+    per_call = 1e6 / (len(calls) * rounds)
+    print(f"Calls: {len(calls)} ({len(set(texts))} distinct strings, {cached_calls} through the cache)")
+    print(f"Cache hit rate: {info.hits / lookups:.1%}" if lookups else "Cache hit rate: n/a")
+    print(f"Original extractors: {legacy * per_call:.2f} us/link")
+    print(f"Compiled:            {uncached * per_call:.2f} us/link")
+    print(f"Call sites + LRU:    {cached * per_call:.2f} us/link")
+
+
+if __name__ == "__main__":
+    main()
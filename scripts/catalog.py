@@ -0,0 +1,153 @@
+"""
+Static catalog builder
+Groups published notes and question papers into one compressed JSON
+file per branch and semester, so the app can load a browse screen with
+a single CDN-cacheable request instead of querying the tables
+"""
+
+import gzip
+import json
+import hashlib
+from collections import defaultdict
+from typing import Optional
+
+# Bump when the file layout changes so old clients keep reading old files
+CATALOG_FORMAT = 1
+CATALOG_PREFIX = f"catalog/v{CATALOG_FORMAT}"
+CATALOG_INDEX_PATH = f"{CATALOG_PREFIX}/index.json"
+
+# Shard for subjects shared by every branch (also merged into each branch)
+COMMON_BRANCH = 'common'
+# Shard for subjects not yet assigned to a branch, e.g. created by the scraper
+UNASSIGNED_BRANCH = 'unassigned'
+
+SUBJECT_COLUMNS = 'id,code,name,branch_id,semester,credits,modules,is_common'
+NOTE_COLUMNS = 'id,subject_id,title,description,module_number,file_url,file_size_bytes,page_count'
+PAPER_COLUMNS = 'id,subject_id,year,exam_type,month,file_url,file_size_bytes'
+
+
+def _shard_key(branch: str, semester: int) -> str:
+    return f"{branch}/{semester}"
+
+
+def _compact(row: dict, skip: tuple = ()) -> dict:
+    """Drop empty fields and the given keys from a row"""
+    return {k: v for k, v in row.items() if v is not None and k not in skip}
+
+
+def build_shards(subjects: list[dict], notes: list[dict],
+                 papers: list[dict]) -> dict[str, dict]:
+    """Build catalog shards keyed by "branch/semester"
+
+    Subjects marked common go to the common shard and are also included
+    in every branch shard for their semester. Other subjects without a
+    branch go to the unassigned shard only.
+    """
+    notes_by_subject = defaultdict(list)
+    for note in notes:
+        notes_by_subject[note['subject_id']].append(_compact(note, skip=('subject_id',)))
+
+    papers_by_subject = defaultdict(list)
+    for paper in papers:
+        papers_by_subject[paper['subject_id']].append(_compact(paper, skip=('subject_id',)))
+
+    entries = defaultdict(list)
+    common = defaultdict(list)
+    branches = set()
+
+    for subject in subjects:
+        entry = _compact(subject, skip=('branch_id', 'is_common', 'semester'))
+        entry['notes'] = sorted(
+            notes_by_subject.get(subject['id'], []),
+            key=lambda n: (n.get('module_number', 0), n.get('title', ''), n['id'])
+        )
+        entry['papers'] = sorted(
+            papers_by_subject.get(subject['id'], []),
+            key=lambda p: (-p.get('year', 0), p.get('exam_type', ''), p['id'])
+        )
+
+        branch = subject.get('branch_id')
+        if subject.get('is_common'):
+            common[subject['semester']].append(entry)
+        elif branch:
+            branches.add(branch)
+            entries[_shard_key(branch, subject['semester'])].append(entry)
+        else:
+            entries[_shard_key(UNASSIGNED_BRANCH, subject['semester'])].append(entry)
+
+    for semester, common_entries in common.items():
+        entries[_shard_key(COMMON_BRANCH, semester)].extend(common_entries)
+        for branch in branches:
+            entries[_shard_key(branch, semester)].extend(common_entries)
+
+    shards = {}
+    for key, shard_subjects in entries.items():
+        branch, semester = key.split('/')
+        shards[key] = {
+            'format': CATALOG_FORMAT,
+            'branch': branch,
+            'semester': int(semester),
+            'subjects': sorted(shard_subjects, key=lambda s: (s['code'], s['id'])),
+        }
+    return shards
+
+
+def encode_shard(shard: dict) -> tuple[str, bytes]:
+    """Return a shard's content version and its gzipped JSON
+
+    The version is a hash of the content, so it only changes when the
+    shard does. A fixed gzip mtime keeps the bytes stable too.
+    """
+    canonical = json.dumps(shard, sort_keys=True, separators=(',', ':'))
+    version = hashlib.sha256(canonical.encode()).hexdigest()[:16]
+    payload = json.dumps({**shard, 'version': version}, sort_keys=True, separators=(',', ':'))
+    return version, gzip.compress(payload.encode(), mtime=0)
+
+
+def shard_path(key: str, version: str) -> str:
+    """Storage path for one version of a shard"""
+    branch, semester = key.split('/')
+    return f"{CATALOG_PREFIX}/{branch}/sem{semester}-{version}.json.gz"
+
+
+def shard_summary(shard: dict, version: str, path: str) -> dict:
+    """Index entry describing a shard"""
+    return {
+        'version': version,
+        'path': path,
+        'subjects': len(shard['subjects']),
+        'notes': sum(len(s['notes']) for s in shard['subjects']),
+        'papers': sum(len(s['papers']) for s in shard['subjects']),
+    }
+
+
+def parse_index(data: Optional[bytes]) -> tuple[dict, dict]:
+    """Read the shards and retired paths of a previously published index"""
+    if not data:
+        return {}, {}
+    try:
+        index = json.loads(data)
+    except ValueError:
+        return {}, {}
+    if index.get('format') != CATALOG_FORMAT:
+        return {}, {}
+    return index.get('shards', {}), index.get('retired', {})
+
+
+def retire_shards(previous: dict, current: dict, retired: dict,
+                  now: float, grace: float) -> tuple[dict, list[str]]:
+    """Track superseded shard paths and pick the ones safe to delete
+
+    Clients may hold a cached index that still points at a superseded
+    shard, so paths are only deleted once they have been retired for
+    longer than the grace period. Returns the paths still retired, with
+    the time they were retired, and the expired paths.
+    """
+    current_paths = {entry['path'] for entry in current.values()}
+    retired = {path: at for path, at in retired.items() if path not in current_paths}
+    for entry in previous.values():
+        if entry['path'] not in current_paths:
+            retired.setdefault(entry['path'], now)
+
+    expired = sorted(path for path, at in retired.items() if now - at > grace)
+    return retired, expired
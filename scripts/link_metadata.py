@@ -0,0 +1,102 @@
+"""
+Link metadata extraction
+Pulls subject code, module, year, exam type and month out of a link's
+text or URL with precompiled patterns, memoized per string
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+# Mirror pages repeat the same anchor texts heavily, so results are cached
+METADATA_CACHE_SIZE = 4096
+
+# =========================================================================
+# Subject code patterns for different regulations
+# =========================================================================
+SUBJECT_PATTERNS = [
+    re.compile(r'([A-Z]{2,3}\d{3})'),      # Standard: CST201, MAT101
+    re.compile(r'([A-Z]{2,4}\d{4})'),      # Extended: CSST2001
+    re.compile(r'(\d{2}[A-Z]{2,3}\d{3})'), # Year prefix: 21CST201
+]
+
+MODULE_PATTERN = re.compile(r'module\s*[-:]?\s*(\d+)', re.IGNORECASE)
+YEAR_PATTERN = re.compile(r'(20[1-2]\d)')
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june',
+          'july', 'august', 'september', 'october', 'november', 'december']
+
+
+@dataclass(frozen=True)
+class LinkMetadata:
+    """Metadata extracted from a link's text or URL"""
+    subject_code: Optional[str]
+    module_number: int
+    year: Optional[int]
+    exam_type: str
+    month: Optional[str]
+
+
+def extract_subject_code(text: str) -> Optional[str]:
+    """Extract subject code from text"""
+    text_upper = text.upper()
+    for pattern in SUBJECT_PATTERNS:
+        match = pattern.search(text_upper)
+        if match:
+            return match.group(1)
+    return None
+
+
+def extract_module_number(text: str) -> int:
+    """Extract module number from text"""
+    match = MODULE_PATTERN.search(text)
+    return int(match.group(1)) if match else 1
+
+
+def extract_year(text: str) -> Optional[int]:
+    """Extract year from text"""
+    match = YEAR_PATTERN.search(text)
+    return int(match.group(1)) if match else None
+
+
+def extract_exam_type(text_lower: str) -> str:
+    """Extract exam type from lowercased text"""
+    if 'supply' in text_lower or 'supplementary' in text_lower:
+        return 'supplementary'
+    elif 'model' in text_lower:
+        return 'model'
+    elif 'solved' in text_lower:
+        return 'solved'
+    return 'regular'
+
+
+def extract_month(text_lower: str) -> Optional[str]:
+    """Extract month from lowercased text"""
+    for month in MONTHS:
+        if month in text_lower:
+            return month.capitalize()
+    return None
+
+
+def parse_link_metadata(text: str) -> LinkMetadata:
+    """Extract all link metadata from text, without caching
+
+    Use this for strings that will not be seen again, such as an anchor
+    text joined with its URL, so they do not push reusable entries out
+    of the cache.
+    """
+    text_lower = text.lower()
+    return LinkMetadata(
+        subject_code=extract_subject_code(text),
+        module_number=extract_module_number(text),
+        year=extract_year(text),
+        exam_type=extract_exam_type(text_lower),
+        month=extract_month(text_lower),
+    )
+
+
+@lru_cache(maxsize=METADATA_CACHE_SIZE)
+def extract_link_metadata(text: str) -> LinkMetadata:
+    """Extract all link metadata from text (e.g., an anchor text or URL)"""
+    return parse_link_metadata(text)
@@ -0,0 +1,32 @@
+"""
+Scraped content models
+Shared by the scraper and its source plugins
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ScrapedNote:
+    """Represents a scraped note document"""
+    title: str
+    description: Optional[str]
+    subject_code: str
+    module_number: int
+    file_url: str
+    file_size_bytes: Optional[int]
+    source_url: str
+    source_name: str
+
+
+@dataclass
+class ScrapedPaper:
+    """Represents a scraped question paper"""
+    subject_code: str
+    year: int
+    exam_type: str
+    month: Optional[str]
+    file_url: str
+    file_size_bytes: Optional[int]
+    source_url: str
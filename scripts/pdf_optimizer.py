@@ -0,0 +1,125 @@
+"""
+PDF optimizer
+Linearizes PDFs for fast web view and recompresses their streams before
+upload, so the in-app viewer can show page 1 before the whole file has
+downloaded
+"""
+
+import io
+import sys
+import subprocess
+import threading
+from typing import Optional
+
+try:
+    import pikepdf
+    from pikepdf import Name, PdfImage
+except ImportError:
+    pikepdf = None  # pikepdf not installed, optimization is skipped
+
+
+def is_available() -> bool:
+    """Whether the optimizer's dependencies are installed"""
+    return pikepdf is not None
+
+
+def _recompress_images(pdf, quality: int):
+    """Re-encode JPEG images at the given quality where that makes them smaller
+
+    Only images that are already lossy (DCTDecode) are touched, and only
+    simple 8-bit RGB or grayscale ones, so nothing else loses quality.
+    """
+    seen = set()
+    for page in pdf.pages:
+        for raw in page.images.values():
+            if raw.objgen in seen:
+                continue
+            seen.add(raw.objgen)
+
+            if raw.get('/Filter') != Name.DCTDecode or '/Decode' in raw:
+                continue
+            if raw.get('/BitsPerComponent') != 8:
+                continue
+            if raw.get('/ColorSpace') not in (Name.DeviceRGB, Name.DeviceGray):
+                continue
+
+            try:
+                image = PdfImage(raw).as_pil_image()
+            except Exception:
+                continue  # Leave images we cannot decode as they are
+
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=quality, optimize=True)
+            if buffer.tell() < len(raw.read_raw_bytes()):
+                raw.write(buffer.getvalue(), filter=Name.DCTDecode)
+
+
+def optimize_pdf(data: bytes, image_quality: Optional[int] = None) -> bytes:
+    """Return a linearized, recompressed copy of a PDF
+
+    Streams are recompressed losslessly. JPEG images are only re-encoded
+    when image_quality (1-95) is given. Raises if the PDF cannot be read.
+    """
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        if image_quality:
+            _recompress_images(pdf, image_quality)
+        pdf.remove_unreferenced_resources()
+
+        output = io.BytesIO()
+        pdf.save(
+            output,
+            linearize=True,
+            compress_streams=True,
+            recompress_flate=True,
+            stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+    return output.getvalue()
+
+
+class OptimizerPool:
+    """Runs optimize_pdf in child processes, a bounded number at a time
+
+    Each file gets its own process so one that hangs can be killed
+    without affecting the others. Children run this module as a script,
+    so they never fork the multi-threaded scraper or re-run its module.
+    """
+
+    def __init__(self, workers: int, timeout: float):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers)
+
+    def optimize(self, data: bytes, image_quality: Optional[int] = None) -> bytes:
+        """Optimize a PDF in a child process
+
+        Raises TimeoutError if it takes longer than the timeout, or
+        RuntimeError if the child fails.
+        """
+        command = [sys.executable, __file__, str(image_quality or 0)]
+        with self._slots:
+            try:
+                # Kills the child if the timeout expires
+                result = subprocess.run(command, input=data, capture_output=True,
+                                        timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                raise TimeoutError(f"PDF optimization exceeded {self.timeout}s")
+
+        if result.returncode != 0:
+            error = result.stderr.decode(errors='replace').strip()
+            raise RuntimeError(error or f"optimizer process exited with code {result.returncode}")
+        return result.stdout
+
+
+def main():
+    """Child process entry point: optimize the PDF on stdin to stdout"""
+    image_quality = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    try:
+        output = optimize_pdf(sys.stdin.buffer.read(), image_quality or None)
+    except Exception as e:
+        sys.stderr.write(repr(e))
+        sys.exit(1)
+    sys.stdout.buffer.write(output)
+
+
+if __name__ == "__main__":
+    main()
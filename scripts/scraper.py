@@ -10,16 +10,20 @@ import json
 import time
 import hashlib
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass
-from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
-from bs4 import BeautifulSoup
 from supabase import create_client, Client
 
+import catalog
+import pdf_optimizer
+from models import ScrapedNote, ScrapedPaper
+from sources import SOURCE_URLS, SourcePlugin, SourceStats, load_source
+
 # Load .env from project root (parent of scripts folder)
 _env_loaded = False
 try:
@@ -48,33 +52,22 @@ if _env_loaded:
 if SUPABASE_URL:
     logger.info(f"Supabase URL configured: {SUPABASE_URL[:30]}...")
 
-# Rate limiting
-REQUEST_DELAY = 2  # seconds between requests
-
+# PostgREST caps rows per response, so bulk reads are paged
+DB_PAGE_SIZE = 1000
 
-@dataclass
-class ScrapedNote:
-    """Represents a scraped note document"""
-    title: str
-    description: Optional[str]
-    subject_code: str
-    module_number: int
-    file_url: str
-    file_size_bytes: Optional[int]
-    source_url: str
-    source_name: str
+# Catalog shards are named by content hash, so they can be cached forever;
+# the index that points at them must stay fresh
+CATALOG_SHARD_MAX_AGE = 31536000  # seconds
+CATALOG_INDEX_MAX_AGE = 300  # seconds
+# Superseded shards outlive every cached index that may point at them
+CATALOG_RETIRE_GRACE = 2 * CATALOG_INDEX_MAX_AGE  # seconds
 
-
-@dataclass
-class ScrapedPaper:
-    """Represents a scraped question paper"""
-    subject_code: str
-    year: int
-    exam_type: str
-    month: Optional[str]
-    file_url: str
-    file_size_bytes: Optional[int]
-    source_url: str
+# PDF optimization before upload (needs pikepdf)
+OPTIMIZE_PDFS = os.environ.get("OPTIMIZE_PDFS", "1") != "0"
+PDF_OPTIMIZE_WORKERS = int(os.environ.get("PDF_OPTIMIZE_WORKERS", "0")) or os.cpu_count() or 1
+PDF_OPTIMIZE_TIMEOUT = 120  # seconds per file before the original is kept
+# JPEG quality cap for images; 0 keeps optimization lossless
+PDF_IMAGE_QUALITY = int(os.environ.get("PDF_IMAGE_QUALITY", "0"))
 
 
 class KTUScraper:
@@ -93,27 +86,25 @@ class KTUScraper:
             self.supabase = None
             logger.warning("Supabase credentials not found. Running in dry-run mode.")
         
-        # Cache for subjects we've already ensured exist
+        # Subject ids known to exist in the database, loaded once per run
         self._subjects_cache = set()
-    
-    def fetch_page(self, url: str) -> Optional[BeautifulSoup]:
-        """Fetch and parse a webpage with rate limiting"""
-        try:
-            time.sleep(REQUEST_DELAY)
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch {url}: {e}")
-            return None
-    
-    def get_file_size(self, url: str) -> Optional[int]:
-        """Get file size from HEAD request"""
-        try:
-            response = self.session.head(url, timeout=10, allow_redirects=True)
-            return int(response.headers.get('content-length', 0))
-        except:
-            return None
+        # New subjects found during the run, waiting for a batch upsert
+        self._pending_subjects = {}
+        # Sources run in parallel threads and share the subject state
+        self._subjects_lock = threading.Lock()
+        
+        if self.supabase:
+            self.load_subjects()
+        
+        # Worker processes for linearizing and recompressing PDFs before upload
+        self._pdf_pool = None
+        self._pdf_stats = {'optimized': 0, 'failed': 0, 'bytes_before': 0, 'bytes_after': 0}
+        self._pdf_stats_lock = threading.Lock()
+        if self.supabase and OPTIMIZE_PDFS:
+            if pdf_optimizer.is_available():
+                self._pdf_pool = pdf_optimizer.OptimizerPool(PDF_OPTIMIZE_WORKERS, PDF_OPTIMIZE_TIMEOUT)
+            else:
+                logger.warning("pikepdf not installed. PDFs will be uploaded unoptimized.")
     
     def convert_google_drive_url(self, url: str) -> Optional[str]:
         """Convert Google Drive viewer URL to direct download URL"""
@@ -145,41 +136,113 @@ class KTUScraper:
         """Generate a hash for deduplication"""
         return hashlib.md5(url.encode()).hexdigest()[:16]
     
+    def fetch_all(self, table: str, columns: str, **filters) -> list[dict]:
+        """Read every matching row from a table, one page at a time"""
+        rows = []
+        offset = 0
+        while True:
+            query = self.supabase.table(table).select(columns)
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            # Offset paging is only stable with an explicit order
+            result = query.order('id').range(offset, offset + DB_PAGE_SIZE - 1).execute()
+            rows.extend(result.data)
+            if len(result.data) < DB_PAGE_SIZE:
+                return rows
+            offset += DB_PAGE_SIZE
+    
+    def load_subjects(self):
+        """Load all existing subject ids into the cache in one paged read"""
+        try:
+            rows = self.fetch_all('subjects', 'id')
+            self._subjects_cache.update(row['id'] for row in rows)
+            logger.info(f"Loaded {len(self._subjects_cache)} existing subjects")
+        except Exception as e:
+            logger.error(f"Failed to load subjects: {e}")
+    
+    def _subject_row(self, subject_code: str, subject_name: str = None) -> dict:
+        """Build the row for a new subject"""
+        return {
+            'id': subject_code.lower(),
+            'code': subject_code.upper(),
+            'name': subject_name or self._format_subject_name(subject_code),
+            'semester': self._guess_semester(subject_code),
+            'credits': 3,  # Default
+        }
+    
+    def queue_subject(self, subject_code: str, subject_name: str = None):
+        """Remember a subject for the next batch upsert if it is not known yet"""
+        subject_id = subject_code.lower()
+        with self._subjects_lock:
+            if subject_id in self._subjects_cache or subject_id in self._pending_subjects:
+                return
+            self._pending_subjects[subject_id] = self._subject_row(subject_code, subject_name)
+    
+    def _take_pending_subjects(self) -> list[dict]:
+        """Remove and return the queued subject rows"""
+        with self._subjects_lock:
+            rows = list(self._pending_subjects.values())
+            self._pending_subjects.clear()
+        return rows
+    
+    def _create_subjects(self, rows: list[dict]) -> set[str]:
+        """Upsert subject rows and return the ids that now exist
+        
+        Runs without holding the subjects lock. If the batch fails, each
+        row is retried on its own so one bad subject does not hold back
+        the rest.
+        """
+        table = self.supabase.table('subjects')
+        try:
+            table.upsert(rows, on_conflict='id', ignore_duplicates=True).execute()
+            created = rows
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Failed to create subject {rows[0]['code']}: {e}")
+                return set()
+            logger.warning(f"Failed to create {len(rows)} subjects in one batch, retrying one by one: {e}")
+            created = []
+            for row in rows:
+                try:
+                    table.upsert(row, on_conflict='id', ignore_duplicates=True).execute()
+                    created.append(row)
+                except Exception as e:
+                    logger.error(f"Failed to create subject {row['code']}: {e}")
+        
+        created_ids = {row['id'] for row in created}
+        with self._subjects_lock:
+            self._subjects_cache.update(created_ids)
+        if created:
+            logger.info(f"Created subjects: {', '.join(row['code'] for row in created)}")
+        return created_ids
+    
+    def flush_subjects(self) -> bool:
+        """Upsert all queued subjects in a single request
+        
+        Returns False if any of them could not be created.
+        """
+        rows = self._take_pending_subjects()
+        if not rows or not self.supabase:
+            return True  # Nothing queued, or dry-run mode
+        return len(self._create_subjects(rows)) == len(rows)
+    
     def ensure_subject_exists(self, subject_code: str, subject_name: str = None) -> bool:
-        """Ensure a subject exists in the database, create if not"""
+        """Ensure a subject exists in the database, create if not
+        
+        Subjects queued earlier in the run are created in the same batch.
+        """
         if not self.supabase:
             return True  # Dry-run mode
         
         subject_id = subject_code.lower()
-        
-        # Check cache first
-        if subject_id in self._subjects_cache:
-            return True
-        
-        try:
-            # Check if subject exists
-            existing = self.supabase.table('subjects').select('id').eq('id', subject_id).execute()
-            
-            if existing.data:
-                self._subjects_cache.add(subject_id)
+        with self._subjects_lock:
+            if subject_id in self._subjects_cache:
                 return True
-            
-            # Create the subject with minimal required fields
-            name = subject_name or self._format_subject_name(subject_code)
-            self.supabase.table('subjects').insert({
-                'id': subject_id,
-                'code': subject_code.upper(),
-                'name': name,
-                'semester': self._guess_semester(subject_code),
-                'credits': 3,  # Default
-            }).execute()
-            
-            self._subjects_cache.add(subject_id)
-            logger.info(f"Created subject: {subject_code}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to ensure subject {subject_code}: {e}")
-            return False
+            self._pending_subjects.pop(subject_id, None)
+        
+        rows = self._take_pending_subjects()
+        rows.append(self._subject_row(subject_code, subject_name))
+        return subject_id in self._create_subjects(rows)
     
     def _format_subject_name(self, code: str) -> str:
         """Format subject code into a readable name"""
@@ -198,10 +261,36 @@ class KTUScraper:
                 return first_digit
         return 1  # Default
     
-    def upload_to_storage(self, file_url: str, filename: str) -> Optional[str]:
-        """Download file and upload to Supabase storage"""
+    def optimize_pdf(self, data: bytes, file_url: str) -> bytes:
+        """Linearize and recompress a PDF in the worker pool
+        
+        Returns the original bytes if optimization fails or times out.
+        """
+        try:
+            optimized = self._pdf_pool.optimize(data, PDF_IMAGE_QUALITY or None)
+        except Exception as e:
+            with self._pdf_stats_lock:
+                self._pdf_stats['failed'] += 1
+            logger.warning(f"Keeping original PDF, optimization failed for {file_url}: {e!r}")
+            return data
+        
+        with self._pdf_stats_lock:
+            self._pdf_stats['optimized'] += 1
+            self._pdf_stats['bytes_before'] += len(data)
+            self._pdf_stats['bytes_after'] += len(optimized)
+        logger.info(f"Optimized PDF {file_url}: {len(data)} -> {len(optimized)} bytes")
+        return optimized
+    
+    def upload_to_storage(self, file_url: str, filename: str,
+                          source: Optional[SourcePlugin] = None) -> Optional[tuple[str, Optional[int]]]:
+        """Download file and upload to Supabase storage
+        
+        The download goes through the source's session and rate limit
+        when one is given. Returns the public URL and the stored size in
+        bytes (None if the file was already stored), or None on failure.
+        """
         if not self.supabase:
-            return file_url  # In dry-run mode, return original URL
+            return file_url, None  # In dry-run mode, return original URL
         
         try:
             # Convert Google Drive URLs to direct download URLs
@@ -221,13 +310,16 @@ class KTUScraper:
                 existing = self.supabase.storage.from_('pdfs').list('notes')
                 if any(f['name'] == filename for f in existing):
                     logger.debug(f"File already exists in storage: {filename}")
-                    return self.supabase.storage.from_('pdfs').get_public_url(path)
+                    return self.supabase.storage.from_('pdfs').get_public_url(path), None
             except:
                 pass  # Continue to upload if check fails
             
             # Download file
-            response = self.session.get(download_url, timeout=60, allow_redirects=True)
-            response.raise_for_status()
+            if source:
+                response = source.fetch(download_url, timeout=60)
+            else:
+                response = self.session.get(download_url, timeout=60, allow_redirects=True)
+                response.raise_for_status()
             
             # Check if it's actually a PDF
             content_type = response.headers.get('content-type', '')
@@ -249,25 +341,30 @@ class KTUScraper:
                 logger.warning(f"Skipping non-PDF file: {file_url} (content-type: {content_type})")
                 return None
             
+            content = response.content
+            if self._pdf_pool:
+                content = self.optimize_pdf(content, file_url)
+            
             # Upload to Supabase storage
             self.supabase.storage.from_('pdfs').upload(
                 path,
-                response.content,
+                content,
                 {'content-type': 'application/pdf'}
             )
             
             # Get public URL
-            return self.supabase.storage.from_('pdfs').get_public_url(path)
+            return self.supabase.storage.from_('pdfs').get_public_url(path), len(content)
         except Exception as e:
             error_str = str(e)
             if 'Duplicate' in error_str or '409' in error_str:
                 # File already exists, return URL
                 path = f"notes/{filename}"
-                return self.supabase.storage.from_('pdfs').get_public_url(path)
+                return self.supabase.storage.from_('pdfs').get_public_url(path), None
             logger.error(f"Failed to upload {file_url}: {e}")
             return None  # Return None to indicate failure
     
-    def save_note(self, note: ScrapedNote, subject_id: str) -> bool:
+    def save_note(self, note: ScrapedNote, subject_id: str,
+                  source: Optional[SourcePlugin] = None) -> bool:
         """Save a scraped note to database"""
         if not self.supabase:
             logger.info(f"[DRY-RUN] Would save note: {note.title}")
@@ -291,11 +388,12 @@ class KTUScraper:
             
             # Upload file to storage
             filename = f"{subject_id}_{note.module_number}_{file_hash}.pdf"
-            stored_url = self.upload_to_storage(note.file_url, filename)
+            stored = self.upload_to_storage(note.file_url, filename, source)
             
-            if not stored_url:
+            if not stored:
                 logger.warning(f"Failed to upload note file: {note.file_url}")
                 return False
+            stored_url, stored_size = stored
             
             # Insert into database
             self.supabase.table('notes').insert({
@@ -304,7 +402,7 @@ class KTUScraper:
                 'subject_id': subject_id,
                 'module_number': note.module_number,
                 'file_url': stored_url,
-                'file_size_bytes': note.file_size_bytes,
+                'file_size_bytes': stored_size or note.file_size_bytes,
                 'source_url': note.source_url,
                 'source_name': note.source_name,
                 'is_verified': False,
@@ -317,7 +415,8 @@ class KTUScraper:
             logger.error(f"Failed to save note {note.title}: {e}")
             return False
     
-    def save_paper(self, paper: ScrapedPaper, subject_id: str) -> bool:
+    def save_paper(self, paper: ScrapedPaper, subject_id: str,
+                   source: Optional[SourcePlugin] = None) -> bool:
         """Save a scraped question paper to database"""
         if not self.supabase:
             logger.info(f"[DRY-RUN] Would save paper: {paper.subject_code} {paper.year}")
@@ -341,11 +440,12 @@ class KTUScraper:
             
             # Upload file to storage with unique filename
             filename = f"paper_{subject_id}_{paper.year}_{paper.exam_type}_{file_hash}.pdf"
-            stored_url = self.upload_to_storage(paper.file_url, filename)
+            stored = self.upload_to_storage(paper.file_url, filename, source)
             
-            if not stored_url:
+            if not stored:
                 logger.warning(f"Failed to upload paper file: {paper.file_url}")
                 return False
+            stored_url, stored_size = stored
             
             # Insert into database
             self.supabase.table('question_papers').insert({
@@ -354,7 +454,7 @@ class KTUScraper:
                 'exam_type': paper.exam_type,
                 'month': paper.month,
                 'file_url': stored_url,
-                'file_size_bytes': paper.file_size_bytes,
+                'file_size_bytes': stored_size or paper.file_size_bytes,
                 'source_url': paper.source_url,
                 'is_verified': False,
                 'is_published': False,  # Needs manual review
@@ -366,6 +466,76 @@ class KTUScraper:
             logger.error(f"Failed to save paper: {e}")
             return False
     
+    def publish_catalog(self):
+        """Publish static catalog files for the app from published rows
+        
+        One gzipped JSON file per branch and semester is stored under
+        catalog/ in the pdfs bucket, named by a hash of its content. Only
+        shards whose content changed since the last publish are uploaded,
+        then index.json is updated to point at the current versions.
+        Superseded shards are deleted on a later publish, once no cached
+        index can still point at them.
+        """
+        if not self.supabase:
+            logger.info("[DRY-RUN] Would publish catalog")
+            return
+        
+        try:
+            subjects = self.fetch_all('subjects', catalog.SUBJECT_COLUMNS)
+            notes = self.fetch_all('notes', catalog.NOTE_COLUMNS, is_published=True)
+            papers = self.fetch_all('question_papers', catalog.PAPER_COLUMNS, is_published=True)
+            shards = catalog.build_shards(subjects, notes, papers)
+            
+            bucket = self.supabase.storage.from_('pdfs')
+            try:
+                previous, retired = catalog.parse_index(bucket.download(catalog.CATALOG_INDEX_PATH))
+            except Exception:
+                previous, retired = {}, {}  # First publish, or index unreadable
+            
+            index = {}
+            uploaded = 0
+            for key, shard in sorted(shards.items()):
+                version, data = catalog.encode_shard(shard)
+                path = catalog.shard_path(key, version)
+                if previous.get(key, {}).get('version') != version:
+                    bucket.upload(path, data, {
+                        'content-type': 'application/gzip',
+                        'cache-control': str(CATALOG_SHARD_MAX_AGE),
+                        'upsert': 'true',
+                    })
+                    uploaded += 1
+                index[key] = catalog.shard_summary(shard, version, path)
+            
+            retired, expired = catalog.retire_shards(
+                previous, index, retired, time.time(), CATALOG_RETIRE_GRACE
+            )
+            if index == previous and not expired:
+                logger.info(f"Catalog unchanged ({len(index)} shards)")
+                return
+            
+            # Expired shards are no longer referenced by the live index
+            if expired:
+                try:
+                    bucket.remove(expired)
+                    retired = {path: at for path, at in retired.items() if path not in expired}
+                    logger.info(f"Deleted {len(expired)} superseded catalog shards")
+                except Exception as e:
+                    logger.warning(f"Failed to delete superseded catalog shards: {e}")
+            
+            bucket.upload(catalog.CATALOG_INDEX_PATH, json.dumps({
+                'format': catalog.CATALOG_FORMAT,
+                'generated_at': datetime.now().isoformat(),
+                'shards': index,
+                'retired': retired,
+            }, sort_keys=True, separators=(',', ':')).encode(), {
+                'content-type': 'application/json',
+                'cache-control': str(CATALOG_INDEX_MAX_AGE),
+                'upsert': 'true',
+            })
+            logger.info(f"Published catalog: {uploaded} of {len(index)} shards updated")
+        except Exception as e:
+            logger.error(f"Failed to publish catalog: {e}")
+    
     def log_scraping_run(self, source: str, items_found: int, items_added: int, 
                          status: str = 'completed', error: Optional[str] = None):
         """Log a scraping run to database"""
@@ -390,347 +560,112 @@ class KTUStudyMaterialsScraper(KTUScraper):
     """Scraper for KTU study materials websites
     
     HOW TO CONFIGURE:
-    1. Add source URLs to BASE_URLS list below
-    2. Implement site-specific scraping logic in scrape_site()
+    1. Add source URLs to SOURCE_URLS in sources/__init__.py
+    2. For sites that need custom logic, add a source plugin in sources/
+       and register it in SOURCE_PLUGINS (others use sources/generic.py)
     3. Test locally: python scraper.py
     4. Set GitHub Secrets for automated runs
-    
-    LEGAL NOTE:
-    Only add URLs for sites that:
-    - Allow automated access (check robots.txt)
-    - Have freely distributable educational content
-    - You have permission to use
     """
     
-    # =========================================================================
-    # CONFIGURE YOUR SOURCE URLs HERE
-    # =========================================================================
-    BASE_URLS = [
-        # Example format - uncomment and modify as needed:
-        "https://ktunotes.in/notes/",
-        "https://www.ktustudents.in/",
-        "https://www.keralanotes.com/p/ktu-study-materials.html?m=1",
-        "https://ktuspecial.in/",
-        "https://ktu2024.web.app/",
-        
-        # Add your verified KTU resource URLs here
-        # Make sure you have permission to scrape these sites
-    ]
-    
-    # =========================================================================
-    # Subject code patterns for different regulations
-    # =========================================================================
-    SUBJECT_PATTERNS = [
-        r'([A-Z]{2,3}\d{3})',      # Standard: CST201, MAT101
-        r'([A-Z]{2,4}\d{4})',      # Extended: CSST2001
-        r'(\d{2}[A-Z]{2,3}\d{3})', # Year prefix: 21CST201
-    ]
-    
-    def extract_subject_code(self, text: str) -> Optional[str]:
-        """Extract subject code from text (e.g., CST201, MAT101)
-        
-        Supports multiple KTU subject code formats:
-        - CST201 (standard)
-        - MAT101 (common subjects)
-        - EST110 (engineering sciences)
-        - HUT200 (humanities)
-        """
-        for pattern in self.SUBJECT_PATTERNS:
-            match = re.search(pattern, text.upper())
-            if match:
-                return match.group(1)
-        return None
-    
-    def extract_module_number(self, text: str) -> int:
-        """Extract module number from text"""
-        match = re.search(r'module\s*[-:]?\s*(\d+)', text, re.IGNORECASE)
-        return int(match.group(1)) if match else 1
-    
-    def extract_year(self, text: str) -> Optional[int]:
-        """Extract year from text (2019-2025)"""
-        match = re.search(r'(20[1-2]\d)', text)
-        return int(match.group(1)) if match else None
-    
     def scrape_all(self):
-        """Main scraping entry point"""
-        total_found = 0
-        total_added = 0
+        """Main scraping entry point
         
-        for base_url in self.BASE_URLS:
-            logger.info(f"Scraping: {base_url}")
-            
-            try:
-                # Use site-specific scraping based on domain
-                domain = urlparse(base_url).netloc
-                
-                if 'ktunotes.in' in domain:
-                    found, added = self.scrape_ktunotes(base_url)
-                else:
-                    # Generic scraping for other sites
-                    found, added = self.scrape_site(base_url)
-                    
-                total_found += found
-                total_added += added
-            except Exception as e:
-                logger.error(f"Error scraping {base_url}: {e}")
-                self.log_scraping_run(base_url, 0, 0, 'failed', str(e))
+        Each source runs in its own thread with its own page pool, so a
+        slow or failing source does not hold back the others.
+        """
+        with ThreadPoolExecutor(max_workers=len(SOURCE_URLS)) as pool:
+            all_stats = list(pool.map(self.scrape_source, SOURCE_URLS))
+        
+        total_found = sum(stats.found for stats in all_stats)
+        total_added = sum(stats.added for stats in all_stats)
         
-        self.log_scraping_run('all_sources', total_found, total_added)
+        # Each source has logged its own row, so the totals are not logged again
         logger.info(f"Scraping complete. Found: {total_found}, Added: {total_added}")
-    
-    def scrape_ktunotes(self, base_url: str) -> tuple[int, int]:
-        """Scrape ktunotes.in using their sitemap"""
-        found = 0
-        added = 0
         
-        # Fetch sitemap to get all content URLs
-        sitemap_url = "https://www.ktunotes.in/post-sitemap.xml"
-        logger.info(f"Fetching sitemap: {sitemap_url}")
+        pdf_stats = self._pdf_stats
+        if pdf_stats['optimized'] or pdf_stats['failed']:
+            logger.info(
+                f"PDF optimization: {pdf_stats['optimized']} optimized, {pdf_stats['failed']} kept original, "
+                f"{pdf_stats['bytes_before']} -> {pdf_stats['bytes_after']} bytes"
+            )
+        
+        self.publish_catalog()
+    
+    def scrape_source(self, base_url: str) -> SourceStats:
+        """Scrape one source with its plugin's pool and rate limit"""
+        logger.info(f"Scraping: {base_url}")
+        stats = SourceStats(source=base_url)
+        start = time.monotonic()
         
         try:
-            response = self.session.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            sitemap_soup = BeautifulSoup(response.content, 'xml')
+            plugin = load_source(base_url)(self, base_url)
+            pages = plugin.discover()
         except Exception as e:
-            logger.error(f"Failed to fetch sitemap: {e}")
-            return self.scrape_site(base_url)  # Fallback to generic scraping
-        
-        # Find all URLs in sitemap
-        urls = sitemap_soup.find_all('loc')
-        logger.info(f"Found {len(urls)} URLs in sitemap")
-        
-        # Filter for notes and question papers URLs
-        notes_urls = []
-        papers_urls = []
-        
-        for url_tag in urls:
-            url = url_tag.text
-            if '-notes' in url and 'notes/' not in url:
-                notes_urls.append(url)
-            elif 'question-paper' in url:
-                papers_urls.append(url)
-        
-        logger.info(f"Found {len(notes_urls)} notes pages, {len(papers_urls)} question paper pages")
-        
-        # Limit for testing (remove in production)
-        max_pages = 50  # Process max 50 pages per run to avoid rate limiting
-        
-        # Scrape notes pages
-        for url in notes_urls[:max_pages]:
-            try:
-                note_found, note_added = self.scrape_ktunotes_page(url, 'notes')
-                found += note_found
-                added += note_added
-            except Exception as e:
-                logger.error(f"Error scraping {url}: {e}")
-        
-        # Scrape question paper pages
-        for url in papers_urls[:max_pages]:
-            try:
-                paper_found, paper_added = self.scrape_ktunotes_page(url, 'papers')
-                found += paper_found
-                added += paper_added
-            except Exception as e:
-                logger.error(f"Error scraping {url}: {e}")
-        
-        return found, added
+            logger.error(f"Error scraping {base_url}: {e}")
+            self.log_scraping_run(base_url, 0, 0, 'failed', str(e))
+            stats.errors += 1
+            return stats
+        
+        deadline = start + plugin.time_budget
+        with ThreadPoolExecutor(max_workers=plugin.max_workers,
+                                thread_name_prefix=plugin.name) as pool:
+            futures = {
+                pool.submit(self.scrape_page, plugin, page_url, content_type, deadline): page_url
+                for page_url, content_type in pages
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping {futures[future]}: {e}")
+                    stats.errors += 1
+                    continue
+                
+                if result is None:
+                    stats.skipped += 1
+                    continue
+                
+                stats.pages += 1
+                stats.found += result[0]
+                stats.added += result[1]
+        
+        stats.elapsed = time.monotonic() - start
+        error = f"{stats.errors} pages failed" if stats.errors else None
+        self.log_scraping_run(base_url, stats.found, stats.added, error=error)
+        logger.info(
+            f"Finished {base_url} in {stats.elapsed:.0f}s. Pages: {stats.pages}, "
+            f"Found: {stats.found}, Added: {stats.added}, "
+            f"Errors: {stats.errors}, Skipped: {stats.skipped}"
+        )
+        return stats
     
-    def scrape_ktunotes_page(self, url: str, content_type: str) -> tuple[int, int]:
-        """Scrape an individual ktunotes.in page for PDF links"""
-        found = 0
-        added = 0
+    def scrape_page(self, plugin: SourcePlugin, page_url: str, content_type: str,
+                    deadline: float) -> Optional[tuple[int, int]]:
+        """Fetch, parse and save one page, or return None past the deadline"""
+        if time.monotonic() > deadline:
+            return None
         
-        soup = self.fetch_page(url)
+        soup = plugin.fetch_page(page_url)
         if not soup:
-            return found, added
-        
-        # Extract subject code from URL
-        # Example: ktu-data-structures-cst201-notes -> CST201
-        subject_code = self.extract_subject_code(url)
-        if not subject_code:
-            logger.warning(f"Could not extract subject code from {url}")
-            return found, added
-        
-        # Get page title for better metadata
-        title_tag = soup.find('h1', class_='entry-title') or soup.find('h1')
-        page_title = title_tag.get_text(strip=True) if title_tag else ''
-        
-        # Find all download links
-        # ktunotes.in uses various link patterns:
-        # 1. Direct PDF links (upload.ktunotes.in)
-        # 2. Google Drive links (drive.google.com/file/d/)
-        
-        download_links = []
-        seen_urls = set()  # Deduplicate links
-        
-        # Domains to skip
-        skip_domains = [
-            'ktunotes.in/category',
-            'ktunotes.in/upload-notes',
-            'facebook.com', 'twitter.com', 'instagram.com',
-            'linkedin.com', 'youtube.com', 'whatsapp.com',
-            't.me', 'telegram',
-        ]
-        
-        # Find PDF links
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '').strip()
-            text = link.get_text(strip=True)
-            
-            # Skip invalid links
-            if not href or href.startswith('#') or href == '/':
-                continue
-            
-            # Skip if we've already seen this URL
-            if href in seen_urls:
-                continue
-            
-            # Skip navigation/social/category links
-            if any(skip in href for skip in skip_domains):
-                continue
-            
-            # Skip dead domains
-            if 'upload.ktunotes.in' in href:
-                continue  # This domain is no longer active
-            
-            # Only accept actual downloadable content
-            is_pdf_link = (
-                href.endswith('.pdf') or
-                (
-                    'drive.google.com/file/d/' in href and
-                    '/view' in href
-                )
-            )
-            
-            if is_pdf_link:
-                seen_urls.add(href)
-                download_links.append({
-                    'url': href,
-                    'text': text,
-                    'module': self.extract_module_number(text or href),
-                })
-        
-        if download_links:
-            logger.info(f"Found {len(download_links)} PDF links on {url}")
-        
-        for link in download_links:
-            found += 1
-            file_url = link['url']
-            link_text = link['text']
-            
-            # Use file URL as source_url for deduplication (each PDF is unique)
-            source_url_for_db = file_url
-            
-            # Determine title
-            if link_text and len(link_text) > 5:
-                title = link_text
-            else:
-                title = f"{page_title} - Module {link['module']}"
-            
-            if content_type == 'papers':
-                year = self.extract_year(link_text + url) or 2024
-                paper = ScrapedPaper(
-                    subject_code=subject_code,
-                    year=year,
-                    exam_type=self._extract_exam_type(link_text),
-                    month=self._extract_month(link_text),
-                    file_url=file_url,
-                    file_size_bytes=None,  # Skip HEAD request to save time
-                    source_url=source_url_for_db
-                )
-                if self.save_paper(paper, subject_code.lower()):
-                    added += 1
-            else:
-                note = ScrapedNote(
-                    title=title[:200],  # Limit title length
-                    description=f"Notes from {page_title}",
-                    subject_code=subject_code,
-                    module_number=link['module'],
-                    file_url=file_url,
-                    file_size_bytes=None,
-                    source_url=source_url_for_db,
-                    source_name='ktunotes.in'
-                )
-                if self.save_note(note, subject_code.lower()):
-                    added += 1
+            return 0, 0
         
-        return found, added
-    
-    def _extract_exam_type(self, text: str) -> str:
-        """Extract exam type from text"""
-        text_lower = text.lower()
-        if 'supply' in text_lower or 'supplementary' in text_lower:
-            return 'supplementary'
-        elif 'model' in text_lower:
-            return 'model'
-        elif 'solved' in text_lower:
-            return 'solved'
-        return 'regular'
-    
-    def _extract_month(self, text: str) -> Optional[str]:
-        """Extract month from text"""
-        months = ['january', 'february', 'march', 'april', 'may', 'june',
-                  'july', 'august', 'september', 'october', 'november', 'december']
-        text_lower = text.lower()
-        for month in months:
-            if month in text_lower:
-                return month.capitalize()
-        return None
-
-    def scrape_site(self, base_url: str) -> tuple[int, int]:
-        """Scrape a specific site - customize per source"""
-        found = 0
-        added = 0
+        items = plugin.parse_page(soup, page_url, content_type)
+        found = len(items)
+        items = [item for item in items if plugin.claim_file(item.file_url)]
         
-        soup = self.fetch_page(base_url)
-        if not soup:
-            return found, added
+        # Create any subjects the page links to in one batch before saving
+        for item in items:
+            self.queue_subject(item.subject_code)
+        self.flush_subjects()
         
-        # Example: Find all PDF links
-        # Customize selectors based on the actual site structure
-        pdf_links = soup.find_all('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
-        
-        for link in pdf_links:
-            href = link.get('href', '')
-            if not href:
-                continue
-            
-            found += 1
-            file_url = urljoin(base_url, href)
-            title = link.get_text(strip=True) or href.split('/')[-1]
-            
-            # Extract metadata from title/URL
-            subject_code = self.extract_subject_code(title + href)
-            module_num = self.extract_module_number(title)
-            year = self.extract_year(title + href)
-            
-            if subject_code:
-                # Determine if it's a note or question paper
-                if year and any(kw in title.lower() for kw in ['question', 'paper', 'exam']):
-                    paper = ScrapedPaper(
-                        subject_code=subject_code,
-                        year=year,
-                        exam_type='regular',
-                        month=None,
-                        file_url=file_url,
-                        file_size_bytes=self.get_file_size(file_url),
-                        source_url=base_url
-                    )
-                    if self.save_paper(paper, subject_code.lower()):
-                        added += 1
-                else:
-                    note = ScrapedNote(
-                        title=title,
-                        description=None,
-                        subject_code=subject_code,
-                        module_number=module_num,
-                        file_url=file_url,
-                        file_size_bytes=self.get_file_size(file_url),
-                        source_url=base_url,
-                        source_name=urlparse(base_url).netloc
-                    )
-                    if self.save_note(note, subject_code.lower()):
-                        added += 1
+        added = 0
+        for item in items:
+            if isinstance(item, ScrapedPaper):
+                saved = self.save_paper(item, item.subject_code.lower(), plugin)
+            else:
+                saved = self.save_note(item, item.subject_code.lower(), plugin)
+            if saved:
+                added += 1
         
         return found, added
 
@@ -743,8 +678,8 @@ def main():
     
     scraper = KTUStudyMaterialsScraper()
     
-    if not scraper.BASE_URLS:
-        logger.warning("No source URLs configured. Please add URLs to BASE_URLS list.")
+    if not SOURCE_URLS:
+        logger.warning("No source URLs configured. Please add URLs to SOURCE_URLS in sources/__init__.py.")
         logger.info("Scraper is ready but needs source URLs to be configured.")
         return
     
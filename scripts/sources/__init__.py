@@ -0,0 +1,82 @@
+"""
+Source plugin registry
+Lists the sites to scrape and maps their domains to the plugin that
+scrapes them. Plugins are named by "module:Class" and only imported
+when a matching URL is scraped.
+"""
+
+import importlib
+import threading
+from urllib.parse import urlparse
+
+from sources.base import RateLimiter, ScrapedItem, SourcePlugin, SourceStats
+
+# =========================================================================
+# CONFIGURE YOUR SOURCE URLs HERE
+# =========================================================================
+# LEGAL NOTE:
+# Only add URLs for sites that:
+# - Allow automated access (check robots.txt)
+# - Have freely distributable educational content
+# - You have permission to use
+SOURCE_URLS = [
+    "https://ktunotes.in/notes/",
+    "https://www.ktustudents.in/",
+    "https://www.keralanotes.com/p/ktu-study-materials.html?m=1",
+    "https://ktuspecial.in/",
+    "https://ktu2024.web.app/",
+
+    # Add your verified KTU resource URLs here
+    # Make sure you have permission to scrape these sites
+]
+
+# =========================================================================
+# REGISTER SOURCE PLUGINS HERE
+# =========================================================================
+# (domain substring, plugin path) - first match wins
+SOURCE_PLUGINS = [
+    ('ktunotes.in', 'sources.ktunotes:KTUNotesSource'),
+]
+
+# Used for any URL that no registered plugin matches
+DEFAULT_PLUGIN = 'sources.generic:GenericSource'
+
+_loaded_plugins = {}
+_load_lock = threading.Lock()
+
+
+def register_source(domain: str, plugin_path: str):
+    """Register a plugin for a domain, ahead of existing registrations"""
+    SOURCE_PLUGINS.insert(0, (domain, plugin_path))
+
+
+def _import_plugin(plugin_path: str) -> type[SourcePlugin]:
+    """Import a plugin class from its "module:Class" path once"""
+    with _load_lock:
+        if plugin_path not in _loaded_plugins:
+            module_name, class_name = plugin_path.split(':')
+            module = importlib.import_module(module_name)
+            _loaded_plugins[plugin_path] = getattr(module, class_name)
+        return _loaded_plugins[plugin_path]
+
+
+def load_source(base_url: str) -> type[SourcePlugin]:
+    """Return the plugin class for a source URL"""
+    domain = urlparse(base_url).netloc
+    for matcher, plugin_path in SOURCE_PLUGINS:
+        if matcher in domain:
+            return _import_plugin(plugin_path)
+    return _import_plugin(DEFAULT_PLUGIN)
+
+
+__all__ = [
+    'SOURCE_URLS',
+    'SOURCE_PLUGINS',
+    'DEFAULT_PLUGIN',
+    'RateLimiter',
+    'ScrapedItem',
+    'SourcePlugin',
+    'SourceStats',
+    'load_source',
+    'register_source',
+]
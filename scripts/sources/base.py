@@ -0,0 +1,140 @@
+"""
+Source plugin base
+A source plugin discovers the pages of one site and parses them into
+notes and question papers. Each plugin gets its own session, rate limit
+and worker pool, so one slow site does not hold back the others.
+"""
+
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import requests
+from bs4 import BeautifulSoup
+
+from models import ScrapedNote, ScrapedPaper
+
+logger = logging.getLogger(__name__)
+
+ScrapedItem = Union[ScrapedNote, ScrapedPaper]
+
+
+@dataclass
+class SourceStats:
+    """Counters for one source's run"""
+    source: str
+    pages: int = 0
+    found: int = 0
+    added: int = 0
+    errors: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+
+class RateLimiter:
+    """Spaces out requests to one source across all of its workers"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        """Block until this source may be sent another request"""
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.delay
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class SourcePlugin(ABC):
+    """Base class for source plugins
+
+    Subclasses tune the class attributes below, override discover() when
+    the site has more than one page worth scraping, and implement
+    parse_page().
+    """
+
+    name = 'generic'
+    max_workers = 2          # concurrent page fetches for this source
+    request_delay = 2        # seconds between requests to this source
+    max_pages = 50           # pages per content type per run
+    time_budget = 20 * 60    # seconds before remaining pages are skipped
+
+    def __init__(self, scraper, base_url: str):
+        self.scraper = scraper
+        self.base_url = base_url
+        self._headers = dict(scraper.session.headers)
+        self._local = threading.local()
+        self.limiter = RateLimiter(self.request_delay)
+        # File URLs already handed out for saving during this run
+        self._claimed_files = set()
+        self._claim_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling worker's session for this source
+
+        requests.Session is not thread-safe, so every worker thread gets
+        its own.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self._headers)
+            self._local.session = session
+        return session
+
+    def fetch(self, url: str, timeout: int = 30) -> requests.Response:
+        """GET a URL from this source, respecting its rate limit"""
+        self.limiter.wait()
+        response = self.session.get(url, timeout=timeout, allow_redirects=True)
+        response.raise_for_status()
+        return response
+
+    def get_file_size(self, url: str) -> Optional[int]:
+        """Get file size from HEAD request"""
+        try:
+            self.limiter.wait()
+            response = self.session.head(url, timeout=10, allow_redirects=True)
+            return int(response.headers.get('content-length', 0))
+        except (requests.RequestException, ValueError):
+            return None
+
+    def fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+        """Fetch and parse a webpage from this source"""
+        try:
+            return BeautifulSoup(self.fetch(url).content, 'html.parser')
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return None
+
+    def claim_file(self, file_url: str) -> bool:
+        """Return True the first time a file URL is seen in this run
+
+        Pages are scraped concurrently and often link the same PDF, so
+        only one of them may save it.
+        """
+        with self._claim_lock:
+            if file_url in self._claimed_files:
+                return False
+            self._claimed_files.add(file_url)
+            return True
+
+    def discover(self) -> list[tuple[str, str]]:
+        """Return (page_url, content_type) pairs to scrape
+
+        content_type is 'notes', 'papers' or 'mixed'. Defaults to the
+        base URL alone.
+        """
+        return [(self.base_url, 'mixed')]
+
+    @abstractmethod
+    def parse_page(self, soup: BeautifulSoup, page_url: str,
+                   content_type: str) -> list[ScrapedItem]:
+        """Extract notes and question papers from a fetched page"""
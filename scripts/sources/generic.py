@@ -0,0 +1,69 @@
+"""
+Generic source plugin
+Scrapes PDF links from a single page - used for sites without a
+dedicated plugin
+"""
+
+import re
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from link_metadata import extract_link_metadata, parse_link_metadata
+from models import ScrapedNote, ScrapedPaper
+from sources.base import ScrapedItem, SourcePlugin
+
+
+class GenericSource(SourcePlugin):
+    """Scrape every PDF link on the base page"""
+
+    name = 'generic'
+
+    def parse_page(self, soup: BeautifulSoup, page_url: str,
+                   content_type: str) -> list[ScrapedItem]:
+        """Scrape a specific site - customize per source"""
+        items = []
+
+        # Example: Find all PDF links
+        # Customize selectors based on the actual site structure
+        pdf_links = soup.find_all('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
+
+        for link in pdf_links:
+            href = link.get('href', '')
+            if not href:
+                continue
+
+            file_url = urljoin(page_url, href)
+            title = link.get_text(strip=True) or href.split('/')[-1]
+
+            # Extract metadata from title/URL - the pair is unique, so not cached
+            metadata = parse_link_metadata(title + href)
+            subject_code = metadata.subject_code
+            module_num = extract_link_metadata(title).module_number
+            year = metadata.year
+
+            if subject_code:
+                # Determine if it's a note or question paper
+                if year and any(kw in title.lower() for kw in ['question', 'paper', 'exam']):
+                    items.append(ScrapedPaper(
+                        subject_code=subject_code,
+                        year=year,
+                        exam_type='regular',
+                        month=None,
+                        file_url=file_url,
+                        file_size_bytes=self.get_file_size(file_url),
+                        source_url=page_url
+                    ))
+                else:
+                    items.append(ScrapedNote(
+                        title=title,
+                        description=None,
+                        subject_code=subject_code,
+                        module_number=module_num,
+                        file_url=file_url,
+                        file_size_bytes=self.get_file_size(file_url),
+                        source_url=page_url,
+                        source_name=urlparse(page_url).netloc
+                    ))
+
+        return items
@@ -0,0 +1,174 @@
+"""
+ktunotes.in source plugin
+Discovers notes and question paper pages from the site's sitemap
+"""
+
+import logging
+
+from bs4 import BeautifulSoup
+
+from link_metadata import extract_link_metadata, parse_link_metadata
+from models import ScrapedNote, ScrapedPaper
+from sources.base import ScrapedItem
+from sources.generic import GenericSource
+
+logger = logging.getLogger(__name__)
+
+
+class KTUNotesSource(GenericSource):
+    """Scrape ktunotes.in using their sitemap"""
+
+    name = 'ktunotes.in'
+    SITEMAP_URL = "https://www.ktunotes.in/post-sitemap.xml"
+
+    # Domains to skip
+    SKIP_DOMAINS = [
+        'ktunotes.in/category',
+        'ktunotes.in/upload-notes',
+        'facebook.com', 'twitter.com', 'instagram.com',
+        'linkedin.com', 'youtube.com', 'whatsapp.com',
+        't.me', 'telegram',
+    ]
+
+    def discover(self) -> list[tuple[str, str]]:
+        """Find notes and question paper pages in the sitemap"""
+        logger.info(f"Fetching sitemap: {self.SITEMAP_URL}")
+
+        try:
+            response = self.fetch(self.SITEMAP_URL)
+            sitemap_soup = BeautifulSoup(response.content, 'xml')
+        except Exception as e:
+            logger.error(f"Failed to fetch sitemap: {e}")
+            return super().discover()  # Fallback to generic scraping
+
+        # Find all URLs in sitemap
+        urls = sitemap_soup.find_all('loc')
+        logger.info(f"Found {len(urls)} URLs in sitemap")
+
+        # Filter for notes and question papers URLs
+        notes_urls = []
+        papers_urls = []
+
+        for url_tag in urls:
+            url = url_tag.text
+            if '-notes' in url and 'notes/' not in url:
+                notes_urls.append(url)
+            elif 'question-paper' in url:
+                papers_urls.append(url)
+
+        logger.info(f"Found {len(notes_urls)} notes pages, {len(papers_urls)} question paper pages")
+
+        return (
+            [(url, 'notes') for url in notes_urls[:self.max_pages]] +
+            [(url, 'papers') for url in papers_urls[:self.max_pages]]
+        )
+
+    def parse_page(self, soup: BeautifulSoup, page_url: str,
+                   content_type: str) -> list[ScrapedItem]:
+        """Scrape an individual ktunotes.in page for PDF links"""
+        if content_type == 'mixed':
+            return super().parse_page(soup, page_url, content_type)
+
+        items = []
+
+        # Extract subject code from URL
+        # Example: ktu-data-structures-cst201-notes -> CST201
+        subject_code = extract_link_metadata(page_url).subject_code
+        if not subject_code:
+            logger.warning(f"Could not extract subject code from {page_url}")
+            return items
+
+        # Get page title for better metadata
+        title_tag = soup.find('h1', class_='entry-title') or soup.find('h1')
+        page_title = title_tag.get_text(strip=True) if title_tag else ''
+
+        # Find all download links
+        # ktunotes.in uses various link patterns:
+        # 1. Direct PDF links (upload.ktunotes.in)
+        # 2. Google Drive links (drive.google.com/file/d/)
+
+        download_links = []
+        seen_urls = set()  # Deduplicate links
+
+        # Find PDF links
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '').strip()
+            text = link.get_text(strip=True)
+
+            # Skip invalid links
+            if not href or href.startswith('#') or href == '/':
+                continue
+
+            # Skip if we've already seen this URL
+            if href in seen_urls:
+                continue
+
+            # Skip navigation/social/category links
+            if any(skip in href for skip in self.SKIP_DOMAINS):
+                continue
+
+            # Skip dead domains
+            if 'upload.ktunotes.in' in href:
+                continue  # This domain is no longer active
+
+            # Only accept actual downloadable content
+            is_pdf_link = (
+                href.endswith('.pdf') or
+                (
+                    'drive.google.com/file/d/' in href and
+                    '/view' in href
+                )
+            )
+
+            if is_pdf_link:
+                seen_urls.add(href)
+                # Anchor texts repeat across pages, file URLs do not
+                metadata = extract_link_metadata(text) if text else parse_link_metadata(href)
+                download_links.append({
+                    'url': href,
+                    'text': text,
+                    'module': metadata.module_number,
+                })
+
+        if download_links:
+            logger.info(f"Found {len(download_links)} PDF links on {page_url}")
+
+        for link in download_links:
+            file_url = link['url']
+            link_text = link['text']
+
+            # Use file URL as source_url for deduplication (each PDF is unique)
+            source_url_for_db = file_url
+
+            # Determine title
+            if link_text and len(link_text) > 5:
+                title = link_text
+            else:
+                title = f"{page_title} - Module {link['module']}"
+
+            if content_type == 'papers':
+                metadata = extract_link_metadata(link_text)
+                # Page URLs start with "http", so no year can span the two
+                year = metadata.year or extract_link_metadata(page_url).year or 2024
+                items.append(ScrapedPaper(
+                    subject_code=subject_code,
+                    year=year,
+                    exam_type=metadata.exam_type,
+                    month=metadata.month,
+                    file_url=file_url,
+                    file_size_bytes=None,  # Skip HEAD request to save time
+                    source_url=source_url_for_db
+                ))
+            else:
+                items.append(ScrapedNote(
+                    title=title[:200],  # Limit title length
+                    description=f"Notes from {page_title}",
+                    subject_code=subject_code,
+                    module_number=link['module'],
+                    file_url=file_url,
+                    file_size_bytes=None,
+                    source_url=source_url_for_db,
+                    source_name='ktunotes.in'
+                ))
+
+        return items